@@ -2,15 +2,22 @@
 メインアプリケーションクラス
 """
 
+import logging
 import os
 import sys
+from functools import partial
 from pathlib import Path
 from typing import Optional
-import importlib.resources
+
+try:
+    from importlib.resources import files as _pkg_files
+except ImportError:
+    # Python 3.8 には importlib.resources.files が無い
+    _pkg_files = None
 
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QFileDialog, QSlider, QPushButton,
-    QLabel, QStatusBar, QTableView, QStyleFactory, QMessageBox
+    QApplication, QMainWindow, QFileDialog,
+    QLabel, QStyleFactory, QMessageBox, QWidget
 )
 
 
@@ -18,43 +25,54 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import (
     QKeySequence, QShortcut, QAction, QIcon, QFont
 )
-from PySide6.QtMultimediaWidgets import QVideoWidget
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QFile, Qt, QUrl, QSize
+from PySide6.QtCore import QFile, Qt, QUrl, QSize, QTimer, QThreadPool
 
 from .ui.custom_ui_loader import CustomUiLoader
-from .core.video_controller import VideoController
+from .core.video_controller import VideoController, FrameRateProbe
 from .core.chapter_manager import ChapterTableManager
 from .core.models import TimePosition
 from .utils.dark_mode import DarkModeDetector
 from .utils.style_manager import StyleManager
 
+logger = logging.getLogger(__name__)
+
 
 class VideoPlayerApp(QMainWindow):
     """メインアプリケーションクラス"""
     
+    # メニュー用フォント（全メニューで共有）
+    _MENU_FONT_LARGE: Optional[QFont] = None
+    _MENU_FONT_SMALL: Optional[QFont] = None
+    
     def __init__(self):
         super().__init__()
         self.file_name: Optional[str] = None
         self.video_controller: Optional[VideoController] = None
+        # メディアプレイヤーは最初に動画を開くときに生成する
+        self.media_player: Optional[QMediaPlayer] = None
+        self.audio_output: Optional[QAudioOutput] = None
         self.chapter_manager: Optional[ChapterTableManager] = None
         
+        # 時間ラベル表示用のキャッシュ
+        self._total_time_str = self._format_time(0)
+        self._last_label_position: Optional[int] = None
+        self._last_slider_px: Optional[int] = None
+        
         # リソースパスの設定（パッケージ化された環境でも動作）
-        try:
+        # 起動が遅くなるため pkg_resources へのフォールバックは行わない
+        if _pkg_files is not None:
             # Python 3.9+
-            import importlib.resources as pkg_resources
-            self.resource_path = Path(pkg_resources.files('movie_viewer'))
-        except (ImportError, AttributeError):
-            # Python 3.8
-            try:
-                import pkg_resources
-                self.resource_path = Path(pkg_resources.resource_filename('movie_viewer', ''))
-            except ImportError:
-                # 開発環境（パッケージ化されていない場合）
-                self.resource_path = Path(__file__).parent
+            self.resource_path = Path(_pkg_files('movie_viewer'))
+        else:
+            # Python 3.8（パッケージはファイルシステム上に展開されている）
+            self.resource_path = Path(__file__).parent
+        
+        # リソースの配置（サブディレクトリか直下か）は一度だけ判定する
+        self._ui_dir = self._resolve_resource_dir("ui")
+        self._icons_dir = self._resolve_resource_dir("icons")
         
         self._setup_ui()
-        self._setup_media_player()
         self._setup_connections()
         self._apply_styles()
     
@@ -62,17 +80,14 @@ class VideoPlayerApp(QMainWindow):
         """UI設定"""
         # UIファイルのロード
         loader = CustomUiLoader()
-        ui_file_path = self.resource_path / "ui" / "video_player.ui"
+        ui_file_path = self._ui_dir / "video_player.ui"
         
         # UIファイルの存在確認
         if not ui_file_path.exists():
-            # 別の可能性のあるパスを試す
-            ui_file_path = self.resource_path / "video_player.ui"
-            if not ui_file_path.exists():
-                print(f"Error: UI file not found at {ui_file_path}")
-                print(f"Current directory: {Path.cwd()}")
-                print(f"Resource path: {self.resource_path}")
-                sys.exit(-1)
+            print(f"Error: UI file not found at {ui_file_path}")
+            print(f"Current directory: {Path.cwd()}")
+            print(f"Resource path: {self.resource_path}")
+            sys.exit(-1)
         
         ui_file = QFile(str(ui_file_path))
         if not ui_file.open(QFile.ReadOnly):
@@ -91,6 +106,10 @@ class VideoPlayerApp(QMainWindow):
         self.setWindowTitle("Video Player App")
         self.setGeometry(100, 100, 1280, 720)
         
+        # アイコンは起動時に一度だけ読み込む
+        self._play_icon = self._resolve_icon("play")
+        self._pause_icon = self._resolve_icon("pause")
+        
         # UIコンポーネントの取得
         self._get_ui_components()
         
@@ -103,28 +122,17 @@ class VideoPlayerApp(QMainWindow):
         # チャプターマネージャーの初期化
         self.chapter_manager = ChapterTableManager(self.table_view)
 
-        # ビデオウィジェットをクリック可能にする（追加）
+        # ビデオウィジェットをクリック可能にする
+        # （クリック時のフォーカス移動は ClickFocusVideoWidget 側で処理）
         self.video_widget.setFocusPolicy(Qt.ClickFocus)
-        self.video_widget.mousePressEvent = lambda event: self.setFocus()
 
 
-    def focusInEvent(self, event):
-        """フォーカスを受け取ったときの処理"""
-        super().focusInEvent(event)
-        print("Debug: VideoPlayerApp received focus.")
-    
-    # ↓ ここに追加 ↓
-    
     def mousePressEvent(self, event):
         """マウスクリックイベントの処理"""
-        # クリックされた位置のウィジェットを取得
-        clicked_widget = self.childAt(event.pos())
-        
-        # テーブルビュー以外がクリックされた場合、メインウィンドウにフォーカスを移動
-        if clicked_widget != self.table_view and not self.table_view.isAncestorOf(clicked_widget):
-            self.setFocus()
-            # デバッグ用（必要に応じて削除可）
-            print("Focus moved from table to main window")
+        # テーブルビュー（ヘッダー・スクロールバーを含む）はクリックを自身で処理するため、
+        # ここに届くのはテーブル以外がクリックされた場合のみ。
+        # childAt によるウィジェットツリーの探索は行わずにフォーカスを移動する
+        self.setFocus()
         
         # 親クラスのイベント処理を呼び出す
         super().mousePressEvent(event)
@@ -132,43 +140,57 @@ class VideoPlayerApp(QMainWindow):
     
     def _get_ui_components(self):
         """UIコンポーネントの取得"""
+        # ウィジェットツリーは1回だけ走査し、オブジェクト名で引けるようにする
+        widgets = {}
+        for widget in self.loaded_ui.findChildren(QWidget):
+            widgets.setdefault(widget.objectName(), widget)
+        
         # ビデオ関連
-        self.video_widget = self.loaded_ui.findChild(QVideoWidget, "videoWidget")
-        self.slider = self.loaded_ui.findChild(QSlider, "slider")
-        self.play_pause_button = self.loaded_ui.findChild(QPushButton, "playButton")
+        self.video_widget = widgets.get("videoWidget")
+        self.slider = widgets.get("slider")
+        self.play_pause_button = widgets.get("playButton")
         
         # コントロールボタン
-        self.copy_time_button = self.loaded_ui.findChild(QPushButton, "copyTimeButton")
-        self.minus_10s_button = self.loaded_ui.findChild(QPushButton, "minus10sButton")
-        self.minus_button = self.loaded_ui.findChild(QPushButton, "minusButton")
-        self.minus_1s_button = self.loaded_ui.findChild(QPushButton, "minus1sButton")
-        self.minus_frame_button = self.loaded_ui.findChild(QPushButton, "minus1fButton")
-        self.plus_frame_button = self.loaded_ui.findChild(QPushButton, "plus1fButton")
-        self.plus_1s_button = self.loaded_ui.findChild(QPushButton, "plus1sButton")
-        self.plus_button = self.loaded_ui.findChild(QPushButton, "plusButton")
-        self.plus_10s_button = self.loaded_ui.findChild(QPushButton, "plus10sButton")
+        self.copy_time_button = widgets.get("copyTimeButton")
+        self.minus_10s_button = widgets.get("minus10sButton")
+        self.minus_button = widgets.get("minusButton")
+        self.minus_1s_button = widgets.get("minus1sButton")
+        self.minus_frame_button = widgets.get("minus1fButton")
+        self.plus_frame_button = widgets.get("plus1fButton")
+        self.plus_1s_button = widgets.get("plus1sButton")
+        self.plus_button = widgets.get("plusButton")
+        self.plus_10s_button = widgets.get("plus10sButton")
         
         # テーブル関連
-        self.table_view = self.loaded_ui.findChild(QTableView, "tableView")
-        self.add_button = self.loaded_ui.findChild(QPushButton, "addButton")
-        self.del_button = self.loaded_ui.findChild(QPushButton, "delButton")
-        self.sort_button = self.loaded_ui.findChild(QPushButton, "sortButton")
-        self.jump_button = self.loaded_ui.findChild(QPushButton, "jumpButton")
-        self.save_button = self.loaded_ui.findChild(QPushButton, "saveButton")
+        self.table_view = widgets.get("tableView")
+        self.add_button = widgets.get("addButton")
+        self.del_button = widgets.get("delButton")
+        self.sort_button = widgets.get("sortButton")
+        self.jump_button = widgets.get("jumpButton")
+        self.save_button = widgets.get("saveButton")
         
         # ラベル
-        self.num_label = self.loaded_ui.findChild(QLabel, "numLabel")
-        self.title_label = self.loaded_ui.findChild(QLabel, "titleLabel")
-        self.status_bar = self.loaded_ui.findChild(QStatusBar, 'statusbar')
+        self.num_label = widgets.get("numLabel")
+        self.title_label = widgets.get("titleLabel")
+        self.status_bar = widgets.get("statusbar")
         
         # プレイボタンの設定
         self.play_pause_button.setStyleSheet("background: transparent; border: none;")
-        icon_path = self.resource_path / "icons" / "play.png"
-        if not icon_path.exists():
-            icon_path = self.resource_path / "play.png"
+        self.play_pause_button.setIcon(self._play_icon)
+        self.play_pause_button.setIconSize(QSize(65, 65))
+    
+    def _resolve_resource_dir(self, name: str) -> Path:
+        """リソースのサブディレクトリを取得（存在しない場合はリソース直下）"""
+        sub_dir = self.resource_path / name
+        return sub_dir if sub_dir.is_dir() else self.resource_path
+    
+    def _resolve_icon(self, name: str) -> QIcon:
+        """アイコンファイルを探して QIcon を生成（見つからない場合は空のアイコン）"""
+        icon_path = self._icons_dir / f"{name}.png"
         if icon_path.exists():
-            self.play_pause_button.setIcon(QIcon(str(icon_path)))
-            self.play_pause_button.setIconSize(QSize(65, 65))
+            return QIcon(str(icon_path))
+        logger.warning("Icon not found: %s.png", name)
+        return QIcon()
     
     def _setup_menu_bar(self):
         """メニューバーの設定"""
@@ -178,16 +200,22 @@ class VideoPlayerApp(QMainWindow):
         menu_bar.setStyleSheet(StyleManager.get_menu_style())
         
         # フォント設定
-        font = QFont("Noto Sans CJK JP", 16)
-        menu_bar.setFont(font)
-        
-        font2 = QFont("Noto Sans CJK JP", 14)
+        font_large, font_small = self._menu_fonts()
+        menu_bar.setFont(font_large)
         
         # ファイルメニューの設定
-        self._setup_file_menu(menu_bar, font2)
+        self._setup_file_menu(menu_bar, font_small)
         
         # スキップメニューの設定
-        self._setup_skip_menu(menu_bar, font2)
+        self._setup_skip_menu(menu_bar, font_small)
+    
+    @classmethod
+    def _menu_fonts(cls) -> tuple:
+        """メニュー用フォント（大・小）を取得（QApplication 生成後に一度だけ作成）"""
+        if cls._MENU_FONT_LARGE is None:
+            cls._MENU_FONT_LARGE = QFont("Noto Sans CJK JP", 16)
+            cls._MENU_FONT_SMALL = QFont("Noto Sans CJK JP", 14)
+        return cls._MENU_FONT_LARGE, cls._MENU_FONT_SMALL
     ''' 
     def _setup_file_menu(self, menu_bar, font):
         """ファイルメニューの設定"""
@@ -268,6 +296,19 @@ class VideoPlayerApp(QMainWindow):
         self.custom_status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.custom_status_label.setStyleSheet(StyleManager.get_status_label_style())
         self.status_bar.addPermanentWidget(self.custom_status_label, 1)
+        
+        # 再生中のラベル更新は最大10Hzにまとめる
+        self._label_timer = QTimer(self)
+        self._label_timer.setSingleShot(True)
+        self._label_timer.setInterval(100)
+        self._label_timer.timeout.connect(self.update_time_label)
+    
+    def _ensure_media_player(self):
+        """メディアプレイヤーを必要になった時点で生成"""
+        if self.media_player is not None:
+            return
+        self._setup_media_player()
+        self._setup_media_connections()
     
     def _setup_media_player(self):
         """メディアプレイヤーの設定"""
@@ -277,39 +318,53 @@ class VideoPlayerApp(QMainWindow):
         self.media_player.setAudioOutput(self.audio_output)
         
         self.video_controller = VideoController(self.media_player)
+        
+        # positionChanged は高頻度で届くため、約16ms（1フレーム）ごとにまとめて反映する
+        self._pending_position = 0
+        self._position_timer = QTimer(self)
+        self._position_timer.setSingleShot(True)
+        self._position_timer.setInterval(16)
+        self._position_timer.setTimerType(Qt.PreciseTimer)
+        self._position_timer.timeout.connect(self._flush_position)
     
-    def _setup_connections(self):
-        """シグナル・スロットの接続"""
-        # メディアプレイヤー
-        self.play_pause_button.clicked.connect(self.toggle_play_pause)
-        self.slider.sliderMoved.connect(self.set_position)
-        self.media_player.positionChanged.connect(self.update_position)
+    def _setup_media_connections(self):
+        """メディアプレイヤー関連のシグナル・スロットの接続"""
+        self.media_player.positionChanged.connect(self._queue_position)
         self.media_player.durationChanged.connect(self.update_duration)
         
-        # コントロールボタン
-        self.copy_time_button.clicked.connect(self.copy_time)
-        
-        # シークボタン
+        # シークボタン（ミリ秒単位）
         seek_buttons = [
             (self.minus_10s_button, -10000),
             (self.minus_button, -1000),
             (self.minus_1s_button, -300),
-            (self.minus_frame_button, -1),  # フレーム単位
-            (self.plus_frame_button, 1),    # フレーム単位
             (self.plus_1s_button, 300),
             (self.plus_button, 1000),
             (self.plus_10s_button, 10000),
         ]
+        # シークボタン（フレーム単位）
+        frame_buttons = [
+            (self.minus_frame_button, -1),
+            (self.plus_frame_button, 1),
+        ]
         
+        # シーク先のメソッドは接続時に一度だけ解決しておく
+        seek_by_milliseconds = self.video_controller.seek_by_milliseconds
         for button, value in seek_buttons:
-            if abs(value) == 1:  # フレーム単位
-                button.clicked.connect(
-                    lambda checked, v=value: self.video_controller.seek_by_frame(v)
-                )
-            else:
-                button.clicked.connect(
-                    lambda checked, v=value: self.video_controller.seek_by_milliseconds(v)
-                )
+            button.clicked.connect(partial(self._on_seek_clicked, seek_by_milliseconds, value))
+        seek_by_frame = self.video_controller.seek_by_frame
+        for button, value in frame_buttons:
+            button.clicked.connect(partial(self._on_seek_clicked, seek_by_frame, value))
+    
+    def _setup_connections(self):
+        """シグナル・スロットの接続"""
+        # メディアプレイヤー
+        self.play_pause_button.clicked.connect(self.toggle_play_pause)
+        self.slider.sliderMoved.connect(self.set_position)
+        # ドラッグ中の値変更は sliderMoved で扱うため valueChanged は離した時のみ
+        self.slider.setTracking(False)
+        
+        # コントロールボタン
+        self.copy_time_button.clicked.connect(self.copy_time)
         
         # テーブル操作
         self.add_button.clicked.connect(self.add_chapter_row)
@@ -323,6 +378,11 @@ class VideoPlayerApp(QMainWindow):
         self.shortcut.activated.connect(self.print_window_geometry)
 
 
+    @staticmethod
+    def _on_seek_clicked(seek, value: int, checked: bool = False):
+        """シークボタンのスロット（clicked の checked 引数は無視する）"""
+        seek(value)
+
     def _apply_styles(self):
         """スタイルの適用"""
         QApplication.setStyle("macOS")
@@ -347,11 +407,13 @@ class VideoPlayerApp(QMainWindow):
             event.accept()
         # Shift + > で1フレーム進む（Shift + . も同じ）
         elif event.modifiers() == Qt.ShiftModifier and (event.key() == Qt.Key_Greater or event.key() == Qt.Key_Period):
-            self.video_controller.seek_by_frame(1)
+            if self.video_controller:
+                self.video_controller.seek_by_frame(1)
             event.accept()
         # Shift + < で1フレーム戻る（Shift + , も同じ）
         elif event.modifiers() == Qt.ShiftModifier and (event.key() == Qt.Key_Less or event.key() == Qt.Key_Comma):
-            self.video_controller.seek_by_frame(-1)
+            if self.video_controller:
+                self.video_controller.seek_by_frame(-1)
             event.accept()
         # Shift + / (?) でヘルプを表示
         elif event.modifiers() == Qt.ShiftModifier and (event.key() == Qt.Key_Question or event.key() == Qt.Key_Slash):
@@ -401,110 +463,89 @@ class VideoPlayerApp(QMainWindow):
 
     def toggle_play_pause(self):
         """再生と一時停止を切り替える"""
+        if self.media_player is None:
+            return
         if self.media_player.playbackState() == QMediaPlayer.PlayingState:
             self.media_player.pause()
-            icon_path = self.resource_path / "icons" / "play.png"
-            if not icon_path.exists():
-                icon_path = self.resource_path / "play.png"
+            self.play_pause_button.setIcon(self._play_icon)
         else:
             self.media_player.play()
-            icon_path = self.resource_path / "icons" / "pause.png"
-            if not icon_path.exists():
-                icon_path = self.resource_path / "pause.png"
-        
-        if icon_path.exists():
-            self.play_pause_button.setIcon(QIcon(str(icon_path)))
+            self.play_pause_button.setIcon(self._pause_icon)
     
     def set_position(self, position: int):
         """再生位置を設定"""
+        if self.media_player is None:
+            return
         self.media_player.setPosition(position)
     
+    def _queue_position(self, position: int):
+        """再生位置の通知を保留し、タイマーで1回の更新にまとめる"""
+        self._pending_position = position
+        if not self._position_timer.isActive():
+            self._position_timer.start()
+    
+    def _flush_position(self):
+        """保留中の再生位置を反映"""
+        self.update_position(self._pending_position)
+    
     def update_position(self, position: int):
         """再生位置の更新"""
-        self.slider.setValue(position)
-        self.update_time_label()
+        # スライダー上のピクセル位置が変わらない場合は再描画しない
+        slider_px = position * self.slider.width() // max(1, self.slider.maximum())
+        if slider_px != self._last_slider_px:
+            self._last_slider_px = slider_px
+            # プログラムからの更新では valueChanged を発行しない
+            self.slider.blockSignals(True)
+            self.slider.setValue(position)
+            self.slider.blockSignals(False)
+        
+        if not self._label_timer.isActive():
+            self._label_timer.start()
     
     def update_duration(self, duration: int):
         """再生時間の更新"""
         self.slider.setRange(0, duration)
+        self._last_slider_px = None
+        self._total_time_str = self._format_time(duration)
+        self._last_label_position = None
         self.update_time_label()
 
     def update_time_label(self):
-        """時間ラベルを更新する（修正版）"""
-        # エラーチェックを追加
-        if not hasattr(self, 'media_player') or not self.media_player:
+        """時間ラベルを更新する"""
+        if self.media_player is None:
             return
-            
-        current_time = self.media_player.position() / 1000  # 現在の再生位置 (秒)
-        total_time = self.media_player.duration() / 1000   # 全体の再生時間 (秒)
 
-        # 現在の再生時間のフォーマット
-        current_hours, current_remainder = divmod(current_time, 3600)
-        current_minutes, current_seconds = divmod(current_remainder, 60)
-
-        # 全体の再生時間のフォーマット
-        total_hours, total_remainder = divmod(total_time, 3600)
-        total_minutes, total_seconds = divmod(total_remainder, 60)
+        # 表示はミリ秒単位なので、同じ位置なら再フォーマットしない
+        position = self.media_player.position()
+        if position == self._last_label_position:
+            return
+        self._last_label_position = position
 
-        # 小数点2桁の従来フォーマット（エラーが出ていた部分）
-        # self.custom_status_label.setText(
-        #     f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:05.2f} / "
-        #     f"{int(total_hours):01}:{int(total_minutes):02}:{total_seconds:05.2f}"
-        # )
-        
-        # 小数点3桁の新フォーマット（copy_timeと統一）
+        # 全体の再生時間は update_duration でフォーマット済みのものを使う
         self.custom_status_label.setText(
-            f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:06.3f} / "
-            f"{int(total_hours):01}:{int(total_minutes):02}:{total_seconds:06.3f}"
+            f"{self._format_time(position)} / {self._total_time_str}"
         )
 
+    @staticmethod
+    def _format_time(milliseconds: int) -> str:
+        """ミリ秒を H:MM:SS.mmm 形式に変換（整数演算のみ）"""
+        hours, remainder = divmod(int(milliseconds), 3600000)
+        minutes, remainder = divmod(remainder, 60000)
+        seconds, millis = divmod(remainder, 1000)
+        return f"{hours}:{minutes:02}:{seconds:02}.{millis:03}"
+
 
     def copy_time(self):
         """現在の再生位置をクリップボードにコピーする"""
-        current_time = self.media_player.position() / 1000  # 現在の再生位置 (秒)
-
-        # 現在の再生時間のフォーマット
-        current_hours, current_remainder = divmod(current_time, 3600)
-        current_minutes, current_seconds = divmod(current_remainder, 60)
-
-        # フォーマットされた時間を作成
-        # 変更前: time_string = f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:05.2f}"
-        time_string = f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:06.3f}"  # ← この行を変更
+        if self.media_player is None:
+            return
+        # ステータスラベルと同じ H:MM:SS.mmm 形式（整数ミリ秒から生成）
+        time_string = self._format_time(self.media_player.position())
 
         # クリップボードにコピー
         QApplication.clipboard().setText(time_string)
         print(f"Copied to clipboard: {time_string}")
 
-    def update_time_label(self):
-        """時間ラベルを更新する（修正版）"""
-        # エラーチェックを追加
-        if not hasattr(self, 'media_player') or not self.media_player:
-            return
-            
-        current_time = self.media_player.position() / 1000  # 現在の再生位置 (秒)
-        total_time = self.media_player.duration() / 1000   # 全体の再生時間 (秒)
-
-        # 現在の再生時間のフォーマット
-        current_hours, current_remainder = divmod(current_time, 3600)
-        current_minutes, current_seconds = divmod(current_remainder, 60)
-
-        # 全体の再生時間のフォーマット
-        total_hours, total_remainder = divmod(total_time, 3600)
-        total_minutes, total_seconds = divmod(total_remainder, 60)
-
-        # 小数点2桁の従来フォーマット（エラーが出ていた部分）
-        # self.custom_status_label.setText(
-        #     f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:05.2f} / "
-        #     f"{int(total_hours):01}:{int(total_minutes):02}:{total_seconds:05.2f}"
-        # )
-        
-        # 小数点3桁の新フォーマット（copy_timeと統一）
-        self.custom_status_label.setText(
-            f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:06.3f} / "
-            f"{int(total_hours):01}:{int(total_minutes):02}:{total_seconds:06.3f}"
-        )
-        
-    
     def add_chapter_row(self):
         """チャプター行を追加"""
         position = self.chapter_manager.add_row()
@@ -527,6 +568,8 @@ class VideoPlayerApp(QMainWindow):
     
     def jump_to_time(self):
         """選択された時間にジャンプ"""
+        if self.media_player is None:
+            return
         time_position = self.chapter_manager.get_selected_time()
         if time_position:
             milliseconds = time_position.to_milliseconds()
@@ -537,42 +580,28 @@ class VideoPlayerApp(QMainWindow):
     
     def open_video(self):
         """動画ファイルを開く"""
-        dialog = QFileDialog(
-            self, 
-            "Open Video File", 
-            "", 
+        file_path = self._get_open_file_name(
+            "Open Video File",
             "Video Files (*.mp4 *.m4v *.avi *.mkv *.mov *.MOV *.ts *.m2ts *.mp3)"
         )
-        
-        self._center_dialog(dialog)
-        
-        if dialog.exec():
-            file_path = dialog.selectedFiles()[0]
-            if file_path:
-                self.initialize_video(file_path)
+        if file_path:
+            self.initialize_video(file_path)
     
     def load_chapter_file(self):
         """チャプターファイルを読み込む"""
-        dialog = QFileDialog(
-            self, 
-            "Open .txt File", 
-            "", 
+        file_path = self._get_open_file_name(
+            "Open .txt File",
             "Text Files (*.txt);;All Files (*)"
         )
-        
-        self._center_dialog(dialog)
-        
-        if dialog.exec():
-            file_path = dialog.selectedFiles()[0]
-            if file_path:
-                try:
-                    self.chapter_manager.load_from_file(file_path)
-                    self.update_row_column_count()
-                    print(f"Loaded file: {file_path}")
-                except UnicodeDecodeError:
-                    print("Error: The file encoding is not UTF-8.")
-                except Exception as e:
-                    print(f"Error loading file: {e}")
+        if file_path:
+            try:
+                self.chapter_manager.load_from_file(file_path)
+                self.update_row_column_count()
+                print(f"Loaded file: {file_path}")
+            except UnicodeDecodeError:
+                print("Error: The file encoding is not UTF-8.")
+            except Exception as e:
+                print(f"Error loading file: {e}")
     
     def save_chapter_file(self):
         """チャプターファイルを保存"""
@@ -580,23 +609,24 @@ class VideoPlayerApp(QMainWindow):
             print("No file name set")
             return
         
-        base_name = os.path.splitext(self.file_name)[0]
-        save_file_name = f"{base_name}.txt"
-        
-        if os.path.exists(save_file_name):
-            reply = QMessageBox.question(
-                self,
-                "Overwrite Confirmation",
-                f"The file '{save_file_name}' already exists.\nDo you want to overwrite it?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            if reply == QMessageBox.No:
-                print("Save canceled by user")
-                return
+        save_file_name = str(Path(self.file_name).with_suffix(".txt"))
         
         try:
-            self.chapter_manager.save_to_file(save_file_name)
+            # 既存ファイルの確認は作成時に行う（O_EXCL）ため、事前の stat は不要
+            try:
+                self.chapter_manager.save_to_file(save_file_name, overwrite=False, durable=True)
+            except FileExistsError:
+                reply = QMessageBox.question(
+                    self,
+                    "Overwrite Confirmation",
+                    f"The file '{save_file_name}' already exists.\nDo you want to overwrite it?",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No
+                )
+                if reply == QMessageBox.No:
+                    print("Save canceled by user")
+                    return
+                self.chapter_manager.save_to_file(save_file_name, overwrite=True, durable=True)
             print(f"Table contents saved to {save_file_name}")
         except Exception as e:
             print(f"Error saving table contents: {e}")
@@ -613,54 +643,72 @@ class VideoPlayerApp(QMainWindow):
     
     def initialize_video(self, file_path: str):
         """動画ファイルを初期化"""
-        if not os.path.exists(file_path):
+        video_path = Path(file_path)
+        if not video_path.exists():
             print(f"File not found: {file_path}")
             return
         
+        self._ensure_media_player()
+        # 前の動画のフレーム情報用キャプチャを閉じる
+        self.video_controller.release_capture()
         self.media_player.setSource(QUrl.fromLocalFile(file_path))
         self.play_pause_button.setEnabled(True)
         
-        # フレームレートを設定
-        frame_rate = VideoController.get_frame_rate(file_path)
-        self.video_controller.set_frame_rate(frame_rate)
+        # フレームレートの取得は UI スレッドを止めないようワーカーで行う
+        self._frame_rate_probe = FrameRateProbe(file_path)
+        self._frame_rate_probe.signals.done.connect(
+            self._apply_frame_rate, Qt.QueuedConnection
+        )
+        QThreadPool.globalInstance().start(self._frame_rate_probe)
         
         # ファイル情報を表示
-        file_name = os.path.basename(file_path)
+        file_name = video_path.name
         self.title_label.setStyleSheet("QLabel { font-size: 16px ;}")
         self.title_label.setText(file_name)
         
         # 動画を再生
         self.media_player.play()
-        icon_path = self.resource_path / "icons" / "pause.png"
-        if not icon_path.exists():
-            icon_path = self.resource_path / "pause.png"
-        if icon_path.exists():
-            self.play_pause_button.setIcon(QIcon(str(icon_path)))
+        self.play_pause_button.setIcon(self._pause_icon)
         self.file_name = file_path
     
-    def _center_dialog(self, dialog: QFileDialog):
-        """ダイアログを中央に配置"""
-        dialog.setOption(QFileDialog.DontUseNativeDialog, True)
-        dialog.adjustSize()
-        dialog_geometry = dialog.geometry()
-        parent_center = self.geometry().center()
-        dialog_geometry.moveCenter(parent_center)
-        dialog.setGeometry(dialog_geometry)
+    def _apply_frame_rate(self, file_path: str, frame_rate: float):
+        """取得したフレームレートを設定（別の動画に切り替わっていれば破棄）"""
+        if file_path != self.file_name:
+            return
+        self.video_controller.set_frame_rate(frame_rate)
+    
+    def _get_open_file_name(self, caption: str, file_filter: str) -> str:
+        """ファイル選択ダイアログを表示（既定は OS ネイティブのダイアログ）"""
+        kwargs = {}
+        # テスト環境などでは環境変数で Qt 独自のダイアログに切り替えられる
+        if os.environ.get("MOVIE_VIEWER_NO_NATIVE_DIALOG"):
+            kwargs["options"] = QFileDialog.DontUseNativeDialog
+        file_path, _ = QFileDialog.getOpenFileName(self, caption, "", file_filter, **kwargs)
+        return file_path
     
     def _rewind_1min(self):
         """1分巻き戻し"""
-        self.video_controller.seek_by_milliseconds(-60000)
+        if self.video_controller:
+            self.video_controller.seek_by_milliseconds(-60000)
     
     def _advance_1min(self):
         """1分早送り"""
-        self.video_controller.seek_by_milliseconds(60000)
+        if self.video_controller:
+            self.video_controller.seek_by_milliseconds(60000)
+    
+    def closeEvent(self, event):
+        """ウィンドウを閉じるときの処理"""
+        # フレーム情報取得用にキャッシュしている VideoCapture を解放
+        if self.video_controller:
+            self.video_controller.release_capture()
+        super().closeEvent(event)
     
     def showEvent(self, event):
         """ウィンドウが表示されるタイミングでの処理"""
         super().showEvent(event)
-        print("Debug: VideoPlayerApp is now visible.")
+        logger.debug("VideoPlayerApp is now visible.")
     
     def focusInEvent(self, event):
         """フォーカスを受け取ったときの処理"""
         super().focusInEvent(event)
-        print("Debug: VideoPlayerApp received focus.")
+        logger.debug("VideoPlayerApp received focus.")
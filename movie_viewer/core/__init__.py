@@ -1,7 +1,7 @@
 """コア機能パッケージ"""
 
-from .video_controller import VideoController
-from .chapter_manager import ChapterTableManager
+from .video_controller import VideoController, FrameRateProbe
+from .chapter_manager import ChapterTableManager, ChapterTableModel
 from .models import TimePosition
 
-__all__ = ['VideoController', 'ChapterTableManager', 'TimePosition']
\ No newline at end of file
+__all__ = ['VideoController', 'FrameRateProbe', 'ChapterTableManager', 'ChapterTableModel', 'TimePosition']
\ No newline at end of file
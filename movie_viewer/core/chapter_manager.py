@@ -2,24 +2,152 @@
 チャプターテーブル管理機能
 """
 
+import logging
+import os
 import re
+import shutil
 #from typing import Optional, List
 from typing import List, Tuple, Optional
 from PySide6.QtWidgets import QTableView, QHeaderView
-from PySide6.QtGui import QStandardItemModel, QStandardItem
-from PySide6.QtCore import Qt, QSortFilterProxyModel
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QKeySequence
 from .models import TimePosition
 
+logger = logging.getLogger(__name__)
+
+
+# 時間形式のパターン (HH:MM:SS.mmm または MM:SS.mmm または HH:MM:SS または MM:SS)
+# 長い形式から順に並べ、最長一致になるようにする
+_TIME_RE = re.compile(r'\d{1,2}:\d{2}:\d{2}\.\d{3}|\d{1,2}:\d{2}\.\d{3}|\d{1,2}:\d{2}:\d{2}|\d{1,2}:\d{2}')
+# タイトル先頭の区切り文字
+_LEAD_SEP_RE = re.compile(r'^[-\s]+')
+# 正規化用のパターン ([HH:]MM:SS[.mmm])
+_NORMALIZE_RE = re.compile(
+    r'^(?:(?P<h>\d{1,2}):)?(?P<m>\d{1,2}):(?P<s>\d{2})(?:\.(?P<ms>\d{1,3}))?$'
+)
+
+
+class ChapterTableModel(QAbstractTableModel):
+    """チャプター（時間, タイトル）を列ごとの Python リストで保持するテーブルモデル"""
+
+    HEADERS = ("Time", "Chapter")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 列ごとのリスト (時間, タイトル)。行ごとのオブジェクトは持たない
+        self._columns: Tuple[List[str], List[str]] = ([], [])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns[0])
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        # 描画時には多数のロールが問い合わせられるため、不要なロールは即座に返す
+        if role != Qt.DisplayRole and role != Qt.EditRole:
+            return None
+        if not index.isValid():
+            return None
+        return self._columns[index.column()][index.row()]
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        self._columns[index.column()][index.row()] = "" if value is None else str(value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def insertRows(self, row: int, count: int,
+                   parent: QModelIndex = QModelIndex()) -> bool:
+        if count <= 0 or row < 0 or row > self.rowCount():
+            return False
+        self.beginInsertRows(parent, row, row + count - 1)
+        for column in self._columns:
+            column[row:row] = [""] * count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row: int, count: int,
+                   parent: QModelIndex = QModelIndex()) -> bool:
+        if count <= 0 or row < 0 or row + count > self.rowCount():
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for column in self._columns:
+            del column[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        """行データをその場でソート"""
+        reverse = order == Qt.DescendingOrder
+        self.layoutAboutToBeChanged.emit()
+        if column == 0:
+            # キーは1行につき1回だけ計算する（解析できない時間は先頭へ）
+            keys = [self._time_key(time_str) for time_str in self._columns[0]]
+        else:
+            keys = self._columns[column]
+        permutation = sorted(
+            range(len(keys)), key=keys.__getitem__, reverse=reverse
+        )
+        for values in self._columns:
+            values[:] = [values[i] for i in permutation]
+
+        # 永続インデックス（選択状態など）を新しい行位置へ付け替える
+        new_position = {old: new for new, old in enumerate(permutation)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [
+            self.index(new_position[index.row()], index.column())
+            for index in old_indexes
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    @staticmethod
+    def _time_key(time_str: str) -> int:
+        """ソート用に時間文字列をミリ秒へ変換"""
+        position = TimePosition.from_string(time_str) if time_str else None
+        return position.to_milliseconds() if position else -1
+
+    def rows(self) -> List[Tuple[str, str]]:
+        """保持している行データを (時間, タイトル) のリストで取得"""
+        return list(zip(*self._columns))
+
+    def insert_row_data(self, row: int, rows: List[Tuple[str, str]]):
+        """複数行のデータを指定位置にまとめて挿入"""
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        times, titles = self._columns
+        times[row:row] = [time_str for time_str, _ in rows]
+        titles[row:row] = [title for _, title in rows]
+        self.endInsertRows()
+
+    def set_rows(self, times: List[str], titles: List[str]):
+        """列データをまとめて置き換える"""
+        self.beginResetModel()
+        self._columns = (times, titles)
+        self.endResetModel()
+
 
 class ChapterTableManager:
     """チャプターテーブルの管理を担当するクラス"""
     
     def __init__(self, table_view: QTableView):
         self.table_view = table_view
-        self.model = QStandardItemModel(0, 2)
-        self.model.setHorizontalHeaderLabels(["Time", "Chapter"])
+        self.model = ChapterTableModel(self.table_view)
         self.table_view.setModel(self.model)
         self._setup_table_view()
     
@@ -29,70 +157,70 @@ class ChapterTableManager:
         self.table_view.setDragEnabled(False)
         self.table_view.setAcceptDrops(False)
         self.table_view.setDropIndicatorShown(False)
+        # 行単位で選択し、selectedRows() で1行1インデックスを取得できるようにする
+        self.table_view.setSelectionBehavior(QTableView.SelectRows)
         
-        # カラム幅の設定
+        # カラム幅の設定（内容に合わせた再計算で全行を走査しないよう固定幅にする）
         header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Fixed)
         header.resizeSection(0, 150)
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.Stretch)
+        
+        # 行の高さはスタイルの既定値で固定する
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
     
     def add_row(self, at_position: Optional[int] = None) -> int:
         """行を追加"""
         if at_position is None:
-            selected_indexes = self.table_view.selectedIndexes()
-            if selected_indexes:
-                at_position = max(index.row() for index in selected_indexes) + 1
+            selected_rows = self.table_view.selectionModel().selectedRows(0)
+            if selected_rows:
+                at_position = max(index.row() for index in selected_rows) + 1
             else:
                 at_position = self.model.rowCount()
         
-        new_row = [QStandardItem("") for _ in range(self.model.columnCount())]
-        self.model.insertRow(at_position, new_row)
+        self.model.insertRows(at_position, 1)
         return at_position
     
     def delete_selected_rows(self) -> List[int]:
         """選択された行を削除"""
-        selected_indexes = self.table_view.selectedIndexes()
-        if not selected_indexes:
+        selected_rows = self.table_view.selectionModel().selectedRows(0)
+        if not selected_rows:
             return []
         
         rows_to_delete = sorted(
-            set(index.row() for index in selected_indexes), 
+            (index.row() for index in selected_rows),
             reverse=True
         )
         
+        # 連続する行は1つの範囲にまとめる（降順なので後ろの範囲から削除される）
+        ranges = []
         for row in rows_to_delete:
-            self.model.removeRow(row)
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+                ranges[-1][1] += 1
+            else:
+                ranges.append([row, 1])
+        
+        self.table_view.setUpdatesEnabled(False)
+        try:
+            for start, count in ranges:
+                self.model.removeRows(start, count)
+        finally:
+            self.table_view.setUpdatesEnabled(True)
         
         return rows_to_delete
     
     def sort_by_time(self):
         """時間順でソート"""
-        proxy_model = QSortFilterProxyModel(self.table_view)
-        proxy_model.setSourceModel(self.model)
-        proxy_model.sort(0, Qt.AscendingOrder)
-        
-        # ソート結果を取得
-        sorted_data = []
-        for row in range(proxy_model.rowCount()):
-            row_data = [
-                proxy_model.index(row, col).data()
-                for col in range(proxy_model.columnCount())
-            ]
-            sorted_data.append(row_data)
-        
-        # モデルを再構築
-        self.model.setRowCount(0)
-        for row_data in sorted_data:
-            items = [QStandardItem(field) for field in row_data]
-            self.model.appendRow(items)
+        self.model.sort(0, Qt.AscendingOrder)
     
     def get_selected_time(self) -> Optional[TimePosition]:
         """選択された行の時間を取得"""
-        selected_indexes = self.table_view.selectedIndexes()
-        if not selected_indexes:
+        selected_rows = self.table_view.selectionModel().selectedRows(0)
+        if not selected_rows:
             return None
         
-        row = selected_indexes[0].row()
+        row = selected_rows[0].row()
         time_str = self.model.data(self.model.index(row, 0))
         
         if time_str:
@@ -103,37 +231,64 @@ class ChapterTableManager:
         """行数とカラム数を取得"""
         return self.model.rowCount(), self.model.columnCount()
     
-    def save_to_file(self, file_path: str):
-        """テーブル内容をファイルに保存"""
-        rows = self.model.rowCount()
-        cols = self.model.columnCount()
+    def save_to_file(self, file_path: str, overwrite: bool = True, durable: bool = False):
+        """
+        テーブル内容をファイルに保存
+        
+        Args:
+            file_path: 保存先のパス
+            overwrite: False の場合、既存ファイルがあれば FileExistsError を送出
+            durable: True の場合、書き込んだ内容をディスクへ同期してから完了する
+        """
+        # 内容を一括で組み立て、書き込みは1回にまとめる
+        # （テキストモードのため改行コードは OS の標準に変換される）
+        payload = "".join(" ".join(row_data) + "\n" for row_data in self.model.rows())
+        if not overwrite:
+            # 新規作成のみ（既存ファイルは壊れないため直接書き込む）
+            with open(file_path, "x", encoding="utf-8", newline=None) as file:
+                file.write(payload)
+                if durable:
+                    file.flush()
+                    os.fsync(file.fileno())
+            return
         
-        with open(file_path, "w", encoding="utf-8") as file:
-            for row in range(rows):
-                row_data = []
-                for col in range(cols):
-                    item = self.model.item(row, col)
-                    row_data.append(item.text() if item else "")
-                file.write(" ".join(row_data) + "\n")
+        # 一時ファイルに書き込んでから置き換え、途中で失敗しても元のファイルを残す
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline=None) as file:
+                file.write(payload)
+                if durable:
+                    file.flush()
+                    os.fsync(file.fileno())
+            # 置き換えで元のファイルの権限が失われないようにする
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
     
     def load_from_file(self, file_path: str):
         """ファイルからテーブル内容を読み込み"""
+        times: List[str] = []
+        titles: List[str] = []
+        # ファイル全体をリスト化せず、1行ずつ読みながら解析する
         with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        self.model.removeRows(0, self.model.rowCount())
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                items = [
-                    QStandardItem(part.strip()) 
-                    for part in re.split(r'\s+', line, maxsplit=1)
-                ]
-                # 不足している列を空文字で埋める
-                while len(items) < self.model.columnCount():
-                    items.append(QStandardItem(""))
-                self.model.appendRow(items)
+            for raw in file:
+                line = raw.strip()
+                if not line:
+                    continue
+                # 連続する空白での分割は str.split で十分（正規表現は不要）
+                parts = line.split(None, 1)
+                # 不足している列は空文字で埋める
+                times.append(parts[0])
+                titles.append(parts[1].strip() if len(parts) > 1 else "")
+
+        # 1行ごとの挿入通知を避け、モデルをまとめて置き換える
+        self.model.set_rows(times, titles)
 
 
     """既存のクラスに以下のメソッドを追加"""
@@ -146,7 +301,7 @@ class ChapterTableManager:
         text = clipboard.text()
         
         if not text:
-            print("Clipboard is empty")
+            logger.info("Clipboard is empty")
             return
         
         try:
@@ -154,34 +309,16 @@ class ChapterTableManager:
             chapters = self._parse_youtube_chapters(text)
             
             if not chapters:
-                print("No valid chapter data found in clipboard")
+                logger.info("No valid chapter data found in clipboard")
                 return
             
-            # 現在の行数を取得
-            current_rows = self.model.rowCount()
-            
-            # 新しい行を追加してデータを設定
-            for time_str, title in chapters:
-                # 新しい行を追加
-                self.model.insertRow(current_rows)
-                
-                # 時間を設定
-                time_index = self.model.index(current_rows, 0)
-                self.model.setData(time_index, time_str, Qt.EditRole)
-                
-                # タイトルを設定
-                title_index = self.model.index(current_rows, 1)
-                self.model.setData(title_index, title, Qt.EditRole)
-                
-                current_rows += 1
+            # 末尾にまとめて追加（挿入通知は1回だけ）
+            self.model.insert_row_data(self.model.rowCount(), chapters)
             
-            print(f"Pasted {len(chapters)} chapters from clipboard")
-            
-            # テーブルを更新
-            self.table_view.resizeColumnsToContents()
+            logger.info("Pasted %d chapters from clipboard", len(chapters))
             
         except Exception as e:
-            print(f"Error pasting chapters: {e}")
+            logger.error("Error pasting chapters: %s", e)
     
 
     def _parse_youtube_chapters(self, text: str) -> List[Tuple[str, str]]:
@@ -195,88 +332,41 @@ class ChapterTableManager:
             [(時間, タイトル), ...] のリスト
         """
         chapters = []
-        
-        # まず改行で分割を試みる
         lines = text.strip().split('\n')
+        single_line = len(lines) == 1
         
-        # 改行がない場合（1行のみ）、時間パターンで分割する
-        if len(lines) == 1 and lines[0]:
-            # 時間形式のパターン (HH:MM:SS.mmm または MM:SS.mmm または HH:MM:SS または MM:SS)
-            time_pattern = re.compile(r'(\d{1,2}:\d{2}:\d{2}\.\d{3}|\d{1,2}:\d{2}\.\d{3}|\d{1,2}:\d{2}:\d{2}|\d{1,2}:\d{2})')
-            
-            # 時間パターンを全て見つける
-            matches = list(time_pattern.finditer(lines[0]))
-            
-            if len(matches) > 1:
-                # 複数の時間が見つかった場合、時間をセパレータとして使用
-                for i, match in enumerate(matches):
-                    time_str = match.group(1)
-                    
-                    # タイトルを抽出
-                    if i + 1 < len(matches):
-                        # 次の時間の開始位置まで
-                        title = lines[0][match.end():matches[i+1].start()].strip()
-                    else:
-                        # 最後の時間の場合、文字列の最後まで
-                        title = lines[0][match.end():].strip()
-                    
-                    # タイトルから先頭の区切り文字を削除
-                    title = re.sub(r'^[-\s]+', '', title)
-                    
-                    # 時間を正規化
-                    normalized_time = self._normalize_time(time_str)
-                    
-                    if title:  # タイトルがある場合のみ追加
-                        chapters.append((normalized_time, title))
-                
-                return chapters
-        
-        # 通常の改行区切りの処理
-        # 時間形式のパターン (HH:MM:SS.mmm または MM:SS.mmm または HH:MM:SS または MM:SS)
-        time_pattern = re.compile(r'(\d{1,2}:\d{2}:\d{2}\.\d{3}|\d{1,2}:\d{2}\.\d{3}|\d{1,2}:\d{2}:\d{2}|\d{1,2}:\d{2})')
-        
+        # 1行に複数の時間がある場合も同じ処理で扱う
         for line in lines:
             line = line.strip()
             if not line:
                 continue
                 
-            # 時間を探す
-            time_matches = list(time_pattern.finditer(line))
-            
-            if time_matches:
-                # 複数の時間がある場合の処理
-                for i, match in enumerate(time_matches):
-                    time_str = match.group(1)
-                    
-                    # タイトルを抽出
-                    if i == 0:
-                        # 最初の時間の場合
-                        before = line[:match.start()].strip()
-                        if i + 1 < len(time_matches):
-                            # 次の時間までの間
-                            after = line[match.end():time_matches[i+1].start()].strip()
-                        else:
-                            # 最後まで
-                            after = line[match.end():].strip()
-                    else:
-                        # 2番目以降の時間
-                        before = line[time_matches[i-1].end():match.start()].strip()
-                        if i + 1 < len(time_matches):
-                            after = line[match.end():time_matches[i+1].start()].strip()
-                        else:
-                            after = line[match.end():].strip()
-                    
-                    # タイトルの決定
-                    title = after if after else before
-                    
-                    # タイトルから先頭の区切り文字を削除
-                    title = re.sub(r'^[-\s]+', '', title)
-                    
-                    # 時間を正規化
-                    normalized_time = self._normalize_time(time_str)
-                    
-                    if title:  # タイトルがある場合のみ追加
-                        chapters.append((normalized_time, title))
+            # 時間を先頭から順に1回だけ走査する（次の一致を先読みする）
+            matches = _TIME_RE.finditer(line)
+            match = next(matches, None)
+            prev_end = 0
+            use_before = None
+            while match is not None:
+                next_match = next(matches, None)
+                if use_before is None:
+                    # 1行だけのテキストで時間が複数ある場合は、前のテキストを使わない
+                    use_before = not single_line or next_match is None
+                # タイトルは次の時間の開始位置まで（最後の時間は行末まで）
+                end = next_match.start() if next_match else len(line)
+                title = line[match.end():end].strip()
+                
+                # タイトルが空なら、前の時間（行頭）からこの時間までのテキストを使う
+                if not title and use_before:
+                    title = line[prev_end:match.start()].strip()
+                
+                # タイトルから先頭の区切り文字を削除
+                title = _LEAD_SEP_RE.sub('', title)
+                
+                if title:  # タイトルがある場合のみ追加
+                    chapters.append((self._normalize_time(match.group()), title))
+                
+                prev_end = match.end()
+                match = next_match
         
         return chapters
 
@@ -288,27 +378,15 @@ class ChapterTableManager:
         MM:SS.mmm -> 0:MM:SS.mmm
         HH:MM:SS.mmm -> HH:MM:SS.mmm
         """
-        # ミリ秒部分を分離
-        parts = time_str.split('.')
-        time_part = parts[0]
-        ms_part = parts[1] if len(parts) > 1 else '000'
-        
-        # 時:分:秒を分離
-        time_components = time_part.split(':')
-        
-        if len(time_components) == 2:  # MM:SS
-            hours = 0
-            minutes = int(time_components[0])
-            seconds = int(time_components[1])
-        elif len(time_components) == 3:  # HH:MM:SS
-            hours = int(time_components[0])
-            minutes = int(time_components[1])
-            seconds = int(time_components[2])
-        else:
+        match = _NORMALIZE_RE.match(time_str)
+        if not match:
             return time_str
         
+        hours = int(match['h'] or 0)
+        minutes = int(match['m'])
+        seconds = int(match['s'])
         # ミリ秒を3桁に正規化
-        ms_part = ms_part.ljust(3, '0')[:3]
+        ms_part = (match['ms'] or '000').ljust(3, '0')
         
         return f"{hours}:{minutes:02d}:{seconds:02d}.{ms_part}"
 
@@ -3,16 +3,50 @@
 """
 
 import re
-from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
-@dataclass
+_TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{2}):(\d{2})(?:\.(\d{1,3}))?$")
+
+
 class TimePosition:
-    """時間情報を管理するデータクラス"""
-    hours: int = 0
-    minutes: int = 0
-    seconds: float = 0.0
+    """時間情報を管理するイミュータブルなデータクラス（__slots__ で軽量化）"""
+    __slots__ = ('hours', 'minutes', 'seconds', '_ms')
+    
+    def __init__(self, hours: int = 0, minutes: int = 0, seconds: float = 0.0):
+        # from_string の結果はキャッシュで共有されるため、生成後は変更不可とする
+        object.__setattr__(self, 'hours', hours)
+        object.__setattr__(self, 'minutes', minutes)
+        object.__setattr__(self, 'seconds', seconds)
+        object.__setattr__(self, '_ms', int(
+            hours * 3600000 +
+            minutes * 60000 +
+            seconds * 1000
+        ))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __reduce__(self):
+        # copy / deepcopy / pickle は __init__ を通して再構築する
+        return (type(self), (self.hours, self.minutes, self.seconds))
+    
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(hours={self.hours!r}, "
+                f"minutes={self.minutes!r}, seconds={self.seconds!r})")
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.hours, self.minutes, self.seconds) ==
+                (other.hours, other.minutes, other.seconds))
+    
+    def __hash__(self) -> int:
+        return hash((self.hours, self.minutes, self.seconds))
     
     @classmethod
     def from_milliseconds(cls, ms: int) -> 'TimePosition':
@@ -23,9 +57,25 @@ class TimePosition:
         return cls(int(hours), int(minutes), seconds)
     
     @classmethod
+    @lru_cache(maxsize=4096)
     def from_string(cls, time_str: str) -> Optional['TimePosition']:
-        """時間文字列から時間情報を生成"""
-        match = re.match(r"^(\d{1,2}):(\d{2}):(\d{2})(?:\.(\d{1,3}))?$", time_str)
+        """時間文字列から時間情報を生成（同じ文字列の解析結果はキャッシュされる）"""
+        # H:MM:SS[.mmm] の標準的な形式は split だけで解析する
+        parts = time_str.split(':')
+        if len(parts) == 3:
+            hours, minutes, seconds = parts
+            seconds, dot, milliseconds = seconds.partition('.')
+            if (0 < len(hours) <= 2 and len(minutes) == 2 and len(seconds) == 2
+                    and len(milliseconds) <= 3 and (milliseconds or not dot)
+                    and (hours + minutes + seconds + milliseconds).isdecimal()):
+                return cls(
+                    int(hours),
+                    int(minutes),
+                    int(seconds) + int(milliseconds or 0) / 1000
+                )
+        
+        # それ以外は正規表現で判定する
+        match = _TIME_PATTERN.match(time_str)
         if not match:
             return None
         
@@ -38,12 +88,8 @@ class TimePosition:
         )
     
     def to_milliseconds(self) -> int:
-        """ミリ秒に変換"""
-        return int(
-            self.hours * 3600000 + 
-            self.minutes * 60000 + 
-            self.seconds * 1000
-        )
+        """ミリ秒に変換（生成時に計算済みの値を返す）"""
+        return self._ms
     
     def to_string(self, include_ms: bool = True) -> str:
         """文字列形式に変換"""
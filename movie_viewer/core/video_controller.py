@@ -2,9 +2,17 @@
 ビデオ再生制御機能
 """
 
+import logging
+import shutil
+import subprocess
+from typing import Optional
+
 import cv2
+from PySide6.QtCore import QObject, QRunnable, QTimer, Signal
 from PySide6.QtMultimedia import QMediaPlayer
 
+logger = logging.getLogger(__name__)
+
 
 class VideoController:
     """ビデオ制御を担当するクラス"""
@@ -12,60 +20,145 @@ class VideoController:
     def __init__(self, media_player: QMediaPlayer):
         self.media_player = media_player
         self.frame_rate = 25.0  # デフォルトフレームレート
+        
+        # 連続したシーク要求（ボタンやキーのオートリピート）は1回の setPosition にまとめる
+        self._pending_seek_ms = 0
+        self._seek_timer = QTimer()
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.setInterval(30)
+        self._seek_timer.timeout.connect(self._apply_pending_seek)
+        
+        # フレーム情報取得用の VideoCapture は同じファイルの間は開いたままにする
+        self._capture: Optional[cv2.VideoCapture] = None
+        self._capture_path: Optional[str] = None
+        self._capture_ms_to_frame = 0.0  # ミリ秒 → フレーム番号の係数 (fps / 1000)
     
     def seek_by_milliseconds(self, milliseconds: int) -> int:
-        """指定されたミリ秒分シーク"""
-        current_position = self.media_player.position()
-        new_position = max(0, current_position + milliseconds)
+        """指定されたミリ秒分シーク（30ms以内の要求は合算して1回でシーク）"""
+        self._pending_seek_ms += milliseconds
+        if not self._seek_timer.isActive():
+            self._seek_timer.start()
+        return max(0, self.media_player.position() + self._pending_seek_ms)
+    
+    def _apply_pending_seek(self):
+        """保留中のシーク量をまとめて反映"""
+        new_position = max(0, self.media_player.position() + self._pending_seek_ms)
+        self._pending_seek_ms = 0
         self.media_player.setPosition(new_position)
-        print(f"Seeked to {new_position / 1000:.2f} seconds")
-        return new_position
+        logger.debug("Seeked to %.2f seconds", new_position / 1000)
     
     def seek_by_frame(self, frame_count: int = 1) -> int:
         """フレーム単位でシーク"""
         frame_duration_ms = 1000 / self.frame_rate
         milliseconds = int(frame_duration_ms * frame_count)
         new_position = self.seek_by_milliseconds(milliseconds)
-        print(f"{'Advanced' if frame_count > 0 else 'Rewound'} {abs(frame_count)} frame(s)")
+        logger.debug("%s %d frame(s)",
+                     'Advanced' if frame_count > 0 else 'Rewound', abs(frame_count))
         return new_position
     
     def set_frame_rate(self, frame_rate: float):
         """フレームレートを設定"""
         self.frame_rate = frame_rate
-        print(f"Frame rate set to {frame_rate} fps")
+        logger.info("Frame rate set to %s fps", frame_rate)
+    
+    @staticmethod
+    def _probe_frame_rate(video_path: str) -> Optional[float]:
+        """ffprobe でヘッダーだけを読んでフレームレートを取得（使えなければ None）"""
+        ffprobe = shutil.which("ffprobe")
+        if ffprobe is None:
+            return None
+        try:
+            output = subprocess.check_output(
+                [ffprobe, "-v", "quiet", "-select_streams", "v:0",
+                 "-show_entries", "stream=r_frame_rate", "-of", "csv=p=0",
+                 video_path],
+                timeout=2,
+            )
+            numerator, _, denominator = output.decode().strip().partition("/")
+            frame_rate = float(numerator) / float(denominator or 1)
+        except (OSError, subprocess.SubprocessError, ValueError, ZeroDivisionError):
+            return None
+        return frame_rate if frame_rate > 0 else None
     
     @staticmethod
     def get_frame_rate(video_path: str) -> float:
         """動画ファイルのフレームレートを取得"""
+        frame_rate = VideoController._probe_frame_rate(video_path)
+        if frame_rate is not None:
+            logger.info("Detected frame rate: %s fps", frame_rate)
+            return frame_rate
+        
+        # ffprobe が使えない場合は OpenCV で取得する
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
-            print("Failed to open video file")
+            logger.warning("Failed to open video file: %s", video_path)
             return 25.0
         
         frame_rate = cap.get(cv2.CAP_PROP_FPS)
         cap.release()
-        print(f"Detected frame rate: {frame_rate} fps")
+        logger.info("Detected frame rate: %s fps", frame_rate)
         return frame_rate
     
-    def get_frame_info(self, file_path: str, position_ms: int) -> tuple[bool, str]:
-        """指定位置のフレーム情報を取得"""
+    def _get_capture(self, file_path: str) -> Optional[cv2.VideoCapture]:
+        """キャッシュ済みの VideoCapture を取得（別のファイルなら開き直す）"""
+        if self._capture is not None and self._capture_path == file_path:
+            return self._capture
+        
+        self.release_capture()
         cap = cv2.VideoCapture(file_path)
         if not cap.isOpened():
+            cap.release()
+            return None
+        self._capture = cap
+        self._capture_path = file_path
+        # fps はファイルごとに一定なので開いたときに1回だけ取得する
+        fps = cap.get(cv2.CAP_PROP_FPS) or self.frame_rate
+        self._capture_ms_to_frame = fps / 1000
+        return cap
+    
+    def release_capture(self):
+        """キャッシュしている VideoCapture を解放"""
+        if self._capture is not None:
+            self._capture.release()
+        self._capture = None
+        self._capture_path = None
+    
+    def get_frame_info(self, file_path: str, position_ms: int) -> tuple[bool, str]:
+        """指定位置のフレーム情報を取得"""
+        cap = self._get_capture(file_path)
+        if cap is None:
             return False, "Failed to open video file"
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_index = int(position_ms / 1000 * fps)
+        frame_index = int(position_ms * self._capture_ms_to_frame)
         
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-        ret, frame = cap.read()
+        # 画素データは使わないため、デコード済みフレームを作らない grab() で十分
+        ret = cap.grab()
         
         if not ret:
-            cap.release()
             return False, f"Failed to read frame at index {frame_index}"
         
         # キーフレーム判定
         is_keyframe = cap.get(cv2.CAP_PROP_POS_FRAMES) == frame_index
         frame_type = "Keyframe (I-frame)" if is_keyframe else "Non-keyframe (P/B-frame)"
         
-        cap.release()
         return True, f"Frame at index {frame_index} is a {frame_type}."
+
+
+class _FrameRateProbeSignals(QObject):
+    """FrameRateProbe の完了通知用シグナル"""
+    done = Signal(str, float)
+
+
+class FrameRateProbe(QRunnable):
+    """フレームレートの取得をワーカースレッドで実行するタスク"""
+    
+    def __init__(self, video_path: str):
+        super().__init__()
+        self.video_path = video_path
+        self.signals = _FrameRateProbeSignals()
+    
+    def run(self):
+        """動画を開いてフレームレートを取得し、完了を通知"""
+        frame_rate = VideoController.get_frame_rate(self.video_path)
+        self.signals.done.emit(self.video_path, frame_rate)
@@ -3,6 +3,7 @@
 Movie Viewer - メインエントリーポイント
 """
 
+import logging
 import sys
 import threading
 from PySide6.QtWidgets import QApplication
@@ -14,20 +15,22 @@ if __name__ == "__main__":
 else:
     from .app import VideoPlayerApp
 
+logger = logging.getLogger(__name__)
+
 
 def main():
     """メインエントリーポイント"""
-    print("Debug: QApplication instance is about to be created.")
+    logger.debug("QApplication instance is about to be created.")
     app = QApplication(sys.argv)
-    print("Debug: QApplication instance created.")
+    logger.debug("QApplication instance created.")
     
     # VideoPlayerApp のインスタンスを作成
     window = VideoPlayerApp()
-    print("Debug: VideoPlayerApp instance created.")
+    logger.debug("VideoPlayerApp instance created.")
     
     # メインウィンドウを表示
     window.show()
-    print("Debug: Window is now visible.")
+    logger.debug("Window is now visible.")
     
     # Qt のイベントを処理（ウィンドウの状態更新）
     app.processEvents()
@@ -37,12 +40,15 @@ def main():
     window.raise_()
     window.setFocus()
     
-    # デバッグ情報を出力
-    print(f"Main thread: {threading.current_thread()}")
-    print(f"Qt main thread: {QThread.currentThread()}")
-    print(f"QCoreApplication instance: {QCoreApplication.instance()}")
-    print(f"Active window: {app.activeWindow()}")
-    print(f"Focus widget: {app.focusWidget()}")
+    # デバッグ情報を出力（無効な場合は文字列の組み立て自体を省く）
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n".join((
+            f"Main thread: {threading.current_thread()}",
+            f"Qt main thread: {QThread.currentThread()}",
+            f"QCoreApplication instance: {QCoreApplication.instance()}",
+            f"Active window: {app.activeWindow()}",
+            f"Focus widget: {app.focusWidget()}",
+        )))
     
     # アプリケーションを実行
     sys.exit(app.exec())
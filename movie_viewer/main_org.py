@@ -2,7 +2,7 @@
 
 import sys
 #from PySide6.QtWidgets import QApplication, QMainWindow, QPushButton
-from PySide6.QtWidgets import QApplication, QMainWindow, QFileDialog, QSlider, QPushButton, QLabel, QStatusBar,QHeaderView, QTableView, QStyleFactory, QMessageBox
+from PySide6.QtWidgets import QApplication, QMainWindow, QFileDialog, QLabel,QHeaderView, QTableView, QStyleFactory, QMessageBox
 from PySide6.QtGui import QKeySequence, QShortcut, QAction
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QKeyEvent, QIcon, QFont
 from PySide6.QtMultimediaWidgets import QVideoWidget
@@ -10,54 +10,61 @@ from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, Qt, Signal
 from PySide6.QtCore import QCoreApplication
 
-from PySide6.QtCore import QEvent, QPoint, QSortFilterProxyModel
+from PySide6.QtCore import QEvent, QPoint
 from PySide6.QtCore import QFile, QIODevice, QUrl, Qt
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QSize, QRect
+from PySide6.QtCore import QSize, QRect, QTimer
 from PySide6.QtMultimediaWidgets import QVideoWidget
 import platform
 #from pydub import AudioSegment
 #from pydub.playback import play
 import subprocess
 import threading
-from PySide6.QtWidgets import QFileDialog, QLineEdit, QAbstractItemView
+from PySide6.QtWidgets import QFileDialog, QLineEdit, QAbstractItemView, QWidget
 import cv2
 
 import re
 import os
+import ctypes
+import plistlib
+from functools import lru_cache
 
 
 PATH = './'
 
 
 
-# macOSでのダークモード判定関数
+# Windows のテーマ設定を保持するレジストリキーと値の名前（呼び出しごとに確保しない）
+_PERSONALIZE_KEY = ctypes.create_unicode_buffer("SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Themes\\Personalize")
+_LIGHT_THEME_VALUE = ctypes.create_unicode_buffer("AppsUseLightTheme")
+
+# macOS のグローバル設定ファイル（ダークモード時のみ AppleInterfaceStyle = "Dark"）
+_GLOBAL_PREFERENCES = "~/Library/Preferences/.GlobalPreferences.plist"
+
+# macOSでのダークモード判定関数（結果はキャッシュする）
+@lru_cache(maxsize=None)
 def is_dark_mode_macos():
+    # AppKit を読み込まず、設定ファイルを直接読む
     try:
-        from AppKit import NSApplication, NSAppearance
-        app = NSApplication.sharedApplication()
-        appearance = app.effectiveAppearance()
-        best_match = appearance.bestMatchFromAppearancesWithNames_([
-            "NSAppearanceNameAqua", "NSAppearanceNameDarkAqua"
-        ])
-        return best_match == "NSAppearanceNameDarkAqua"
+        with open(os.path.expanduser(_GLOBAL_PREFERENCES), "rb") as file:
+            return plistlib.load(file).get("AppleInterfaceStyle") == "Dark"
+    except FileNotFoundError:
+        return False
     except Exception as e:
         print(f"Error determining dark mode on macOS: {e}")
         return False
 
-# Windowsでのダークモード判定関数
+# Windowsでのダークモード判定関数（結果はキャッシュする）
+@lru_cache(maxsize=None)
 def is_dark_mode_windows():
     try:
-        import ctypes
         registry = ctypes.windll.advapi32
-        key = ctypes.create_unicode_buffer("SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Themes\\Personalize")
-        value = ctypes.create_unicode_buffer("AppsUseLightTheme")
         data = ctypes.c_long()
         size = ctypes.c_ulong(ctypes.sizeof(data))
 
         hkey = ctypes.c_void_p()
-        if registry.RegOpenKeyExW(0x80000001, key, 0, 0x20019, ctypes.byref(hkey)) == 0:
-            if registry.RegQueryValueExW(hkey, value, 0, None, ctypes.byref(data), ctypes.byref(size)) == 0:
+        if registry.RegOpenKeyExW(0x80000001, _PERSONALIZE_KEY, 0, 0x20019, ctypes.byref(hkey)) == 0:
+            if registry.RegQueryValueExW(hkey, _LIGHT_THEME_VALUE, 0, None, ctypes.byref(data), ctypes.byref(size)) == 0:
                 registry.RegCloseKey(hkey)
                 return data.value == 0  # 0 = ダークモード, 1 = ライトモード
     except Exception as e:
@@ -65,6 +72,7 @@ def is_dark_mode_windows():
     return False
 
 # ダークモード判定のOSごとのラッパー関数
+@lru_cache(maxsize=None)
 def is_dark_mode():
     if platform.system() == "Darwin":  # macOS
         return is_dark_mode_macos()
@@ -170,6 +178,11 @@ class VideoPlayerApp(QMainWindow):
         # ロードしたUIを中央ウィジェットとして設定
         self.setCentralWidget(self.loaded_ui)
 
+        # ウィジェットツリーは1回だけ走査し、オブジェクト名で引けるようにする
+        widgets = {}
+        for widget in self.loaded_ui.findChildren(QWidget):
+            widgets.setdefault(widget.objectName(), widget)
+
         # ウィンドウサイズを指定
         self.resize(1025, 597)
         print(f"Debug: Window resized to 1280x708.")
@@ -222,22 +235,25 @@ class VideoPlayerApp(QMainWindow):
         print("Debug: Shortcut Ctrl+P has been set up.")
 
 
-        self.video_widget = self.loaded_ui.findChild(QVideoWidget, "videoWidget")
-        self.slider = self.loaded_ui.findChild(QSlider, "slider")
-        self.play_pause_button = self.loaded_ui.findChild(QPushButton, "playButton")
+        self.video_widget = widgets.get("videoWidget")
+        self.slider = widgets.get("slider")
+        self.play_pause_button = widgets.get("playButton")
         self.play_pause_button.setStyleSheet("background: transparent; border: none;")
-        self.play_pause_button.setIcon(QIcon(PATH+"/icons/play.png"))
+        # 再生・一時停止アイコンは一度だけ読み込んで使い回す
+        self._play_icon = QIcon(PATH+"/icons/play.png")
+        self._pause_icon = QIcon(PATH+"/icons/pause.png")
+        self.play_pause_button.setIcon(self._play_icon)
         self.play_pause_button.setIconSize(QSize(65, 65))  # アイコンのサイズを指定
-        self.copy_time_button = self.loaded_ui.findChild(QPushButton, "copyTimeButton")
-        self.minus_10s_button = self.loaded_ui.findChild(QPushButton, "minus10sButton")
-        self.minus_button = self.loaded_ui.findChild(QPushButton, "minusButton")
-        self.minus_1s_button = self.loaded_ui.findChild(QPushButton, "minus1sButton")
-        self.minus_frame_button = self.loaded_ui.findChild(QPushButton, "minus1fButton")
-        self.plus_frame_button = self.loaded_ui.findChild(QPushButton, "plus1fButton")
-        self.plus_1s_button = self.loaded_ui.findChild(QPushButton, "plus1sButton")
-        self.plus_button = self.loaded_ui.findChild(QPushButton, "plusButton")
-        self.plus_10s_button = self.loaded_ui.findChild(QPushButton, "plus10sButton")
-        self.num_label = self.loaded_ui.findChild(QLabel, "numLabel")
+        self.copy_time_button = widgets.get("copyTimeButton")
+        self.minus_10s_button = widgets.get("minus10sButton")
+        self.minus_button = widgets.get("minusButton")
+        self.minus_1s_button = widgets.get("minus1sButton")
+        self.minus_frame_button = widgets.get("minus1fButton")
+        self.plus_frame_button = widgets.get("plus1fButton")
+        self.plus_1s_button = widgets.get("plus1sButton")
+        self.plus_button = widgets.get("plusButton")
+        self.plus_10s_button = widgets.get("plus10sButton")
+        self.num_label = widgets.get("numLabel")
 
 
         # Menuの設定
@@ -329,7 +345,7 @@ class VideoPlayerApp(QMainWindow):
 
 
         # tableViewを取得
-        self.table_view = self.loaded_ui.findChild(QTableView, "tableView")
+        self.table_view = widgets.get("tableView")
         #self.table_view.setDropIndicatorShown(True)
         # モデルを作成
         """QTableViewの設定とカラム追加"""
@@ -340,7 +356,7 @@ class VideoPlayerApp(QMainWindow):
 
         self.table_view.setModel(self.model)
 
-        self.status_bar = self.loaded_ui.findChild(QStatusBar, 'statusbar')
+        self.status_bar = widgets.get("statusbar")
         # カスタム QLabel を作成
         self.custom_status_label = QLabel()
         self.custom_status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)  # 右寄せ
@@ -351,23 +367,23 @@ class VideoPlayerApp(QMainWindow):
         # ステータスバーにカスタム QLabel を追加
         self.status_bar.addPermanentWidget(self.custom_status_label, 1)
         # titleLabel を取得
-        self.title_label = self.loaded_ui.findChild(QLabel, "titleLabel")
+        self.title_label = widgets.get("titleLabel")
 
 
         #self.volume_slider = self.findChild(QSlider, "volumeSlider")
-        self.add_button = self.loaded_ui.findChild(QPushButton, "addButton")
+        self.add_button = widgets.get("addButton")
         self.add_button.clicked.connect(self.add_row)
 
-        self.del_button = self.loaded_ui.findChild(QPushButton, "delButton")
+        self.del_button = widgets.get("delButton")
         self.del_button.clicked.connect(self.del_row)
 
-        self.sort_button = self.loaded_ui.findChild(QPushButton, "sortButton")
+        self.sort_button = widgets.get("sortButton")
         self.sort_button.clicked.connect(self.sort_by_time)
 
-        self.jump_button = self.loaded_ui.findChild(QPushButton, "jumpButton")
+        self.jump_button = widgets.get("jumpButton")
         self.jump_button.clicked.connect(self.jump_to_time)
 
-        self.save_button = self.loaded_ui.findChild(QPushButton, "saveButton")
+        self.save_button = widgets.get("saveButton")
         self.save_button.clicked.connect(self.save)
 
 
@@ -379,6 +395,18 @@ class VideoPlayerApp(QMainWindow):
         self.media_player.setVideoOutput(self.video_widget)
         self.media_player.setAudioOutput(self.audio_output)
 
+        # フレーム単位の操作に使う VideoCapture（動画ごとに1つだけ開いておく）
+        self._cap = None
+        self._cap_path = None
+        self._cap_fps = 0.0
+
+        # 時間ラベルの更新は positionChanged ごとではなく 100ms に1回までにまとめる
+        self._last_label_text = None
+        self._label_timer = QTimer(self)
+        self._label_timer.setSingleShot(True)
+        self._label_timer.setInterval(100)
+        self._label_timer.timeout.connect(self.update_time_label)
+
 
         # ボタンの接続
         self.play_pause_button.clicked.connect(self.toggle_play_pause)
@@ -410,6 +438,11 @@ class VideoPlayerApp(QMainWindow):
 
         #self.init_ui()
 
+    def closeEvent(self, event):
+        """ウィンドウを閉じるときに VideoCapture を解放"""
+        self._release_capture()
+        super().closeEvent(event)
+
     def showEvent(self, event):
         """ウィンドウが表示されるタイミングでログを出力"""
         super().showEvent(event)
@@ -432,10 +465,10 @@ class VideoPlayerApp(QMainWindow):
         """再生と一時停止を切り替える"""
         if self.media_player.playbackState() == QMediaPlayer.PlayingState:
             self.media_player.pause()
-            self.play_pause_button.setIcon(QIcon(PATH+"/icons/play.png"))  # 一時停止時にplay.pngを設定
+            self.play_pause_button.setIcon(self._play_icon)  # 一時停止時にplay.pngを設定
         else:
             self.media_player.play()
-            self.play_pause_button.setIcon(QIcon(PATH+"/icons/pause.png"))  # 再生時にpause.pngを設定
+            self.play_pause_button.setIcon(self._pause_icon)  # 再生時にpause.pngを設定
 
     def update_row_column_count(self):
         """行数とカラム数をラベルに表示"""
@@ -449,7 +482,8 @@ class VideoPlayerApp(QMainWindow):
 
     def update_position(self, position):
         self.slider.setValue(position)
-        self.update_time_label()
+        if not self._label_timer.isActive():
+            self._label_timer.start()
 
     def update_duration(self, duration):
         self.slider.setRange(0, duration)
@@ -467,10 +501,14 @@ class VideoPlayerApp(QMainWindow):
         total_hours, total_remainder = divmod(total_time, 3600)
         total_minutes, total_seconds = divmod(total_remainder, 60)
 
-        self.custom_status_label.setText(
+        text = (
             f"{int(current_hours):01}:{int(current_minutes):02}:{current_seconds:05.2f} / "
             f"{int(total_hours):01}:{int(total_minutes):02}:{total_seconds:05.2f}"
         )
+        # 表示内容が変わらない場合は再描画を発生させない
+        if text != self._last_label_text:
+            self._last_label_text = text
+            self.custom_status_label.setText(text)
 
 
     def copy_time(self):
@@ -500,30 +538,9 @@ class VideoPlayerApp(QMainWindow):
         self.table_view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
 
     def sort_by_time(self):
-        # プロキシモデルを使用してソート
-        proxy_model = QSortFilterProxyModel(self)
-        proxy_model.setSourceModel(self.model)
-        
-        # Timeカラム(0列目)を昇順にソート
-        proxy_model.sort(0, Qt.AscendingOrder)
-        
-        # ソート結果を新しいモデルに追加
-        sorted_data = []
-        for row in range(proxy_model.rowCount()):
-            row_data = [
-                proxy_model.index(row, col).data()
-                for col in range(proxy_model.columnCount())
-            ]
-            sorted_data.append(row_data)
-
-        # 元のモデルをリセットして、ソートされたデータを再挿入
-        self.model.setRowCount(0)
-        for row_data in sorted_data:
-            items = [QStandardItem(field) for field in row_data]
-            self.model.appendRow(items)
-
-        # 再設定
-        self.table_view.setModel(self.model)
+        # Timeカラム(0列目)を昇順に、モデル上でその場でソートする
+        # （プロキシモデル経由の取り出しとモデルの再構築は行わない）
+        self.model.sort(0, Qt.AscendingOrder)
 
 
     def rewind_10_seconds(self):
@@ -586,12 +603,10 @@ class VideoPlayerApp(QMainWindow):
 
     def advance_one_frame(self):
         """再生位置を1フレーム分進める"""
-        # フレームごとの再生時間を計算（ミリ秒単位）
-        frame_duration_ms = 1000 / self.frame_rate
         # 現在の再生位置を取得
         current_position = self.media_player.position()  # ミリ秒単位
-        # 新しい再生位置を計算
-        new_position = current_position + frame_duration_ms
+        # 新しい再生位置を計算（1フレームの時間は set_frame_rate で計算済み）
+        new_position = current_position + self._frame_duration_ms
         # 再生位置を設定
         self.media_player.setPosition(int(new_position))
         print(f"Advanced 1 frame to {new_position / 1000:.2f} seconds")
@@ -638,13 +653,18 @@ class VideoPlayerApp(QMainWindow):
             print("No row selected to delete")
 
     def get_frame_rate(self, video_path):
-        """動画ファイルのフレームレートを取得"""
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            print("Failed to open video file")
-            return 25.0  # デフォルト値
-        frame_rate = cap.get(cv2.CAP_PROP_FPS)
-        cap.release()
+        """動画ファイルのフレームレートを取得（開いている VideoCapture があれば再利用）"""
+        if self._cap is not None and self._cap_path == video_path:
+            frame_rate = self._cap_fps
+        else:
+            cap = cv2.VideoCapture(video_path)
+            if not cap.isOpened():
+                print("Failed to open video file")
+                return 25.0  # デフォルト値
+            frame_rate = cap.get(cv2.CAP_PROP_FPS)
+            cap.release()
+        if frame_rate <= 0:
+            return 25.0  # フレームレートが取得できない場合もデフォルト値
         print(f"Detected frame rate: {frame_rate} fps")
         return frame_rate
 
@@ -653,8 +673,30 @@ class VideoPlayerApp(QMainWindow):
     def set_frame_rate(self, frame_rate):
         """フレームレートを設定"""
         self.frame_rate = frame_rate
+        # フレームごとの再生時間（ミリ秒単位）
+        self._frame_duration_ms = 1000 / frame_rate
         print(f"Frame rate set to {frame_rate} fps")
 
+    def _open_capture(self, file_path):
+        """動画ファイルの VideoCapture を開いて保持する"""
+        self._release_capture()
+        cap = cv2.VideoCapture(file_path)
+        if not cap.isOpened():
+            cap.release()
+            print("Failed to open video file.")
+            return
+        self._cap = cap
+        self._cap_path = file_path
+        self._cap_fps = cap.get(cv2.CAP_PROP_FPS)
+
+    def _release_capture(self):
+        """保持している VideoCapture を解放"""
+        if self._cap is not None:
+            self._cap.release()
+        self._cap = None
+        self._cap_path = None
+        self._cap_fps = 0.0
+
 
     def print_window_geometry(self):
         """現在のウィンドウ位置とサイズを出力"""
@@ -705,20 +747,25 @@ class VideoPlayerApp(QMainWindow):
             file_path = dialog.selectedFiles()[0]
             if file_path:
                 try:
-                    # ファイルを読み込み
+                    # ファイルを1行ずつ読みながら、先にすべての行を解析しておく
+                    parsed = []
                     with open(file_path, 'r', encoding='utf-8') as file:
-                        lines = file.readlines()
-
-                    # テーブルモデルをクリア
-                    self.model.removeRows(0, self.model.rowCount())
-
-                    # 行ごとにデータを追加
-                    for line in lines:
-                        line = line.strip()
-                        if line:  # 空行をスキップ
-                            # 最初のスペースのみで分割
-                            items = [QStandardItem(part.strip()) for part in re.split(r'\s+', line, maxsplit=1)]
-                            self.model.appendRow(items)
+                        for line in file:
+                            line = line.strip()
+                            if line:  # 空行をスキップ
+                                # 最初の空白（連続する空白を含む）のみで分割
+                                parsed.append(line.split(None, 1))
+
+                    # テーブルモデルをクリアし、行数を一度に確保してからセルを埋める
+                    self.table_view.setUpdatesEnabled(False)
+                    try:
+                        self.model.removeRows(0, self.model.rowCount())
+                        self.model.setRowCount(len(parsed))
+                        for row, parts in enumerate(parsed):
+                            for col, text in enumerate(parts):
+                                self.model.setItem(row, col, QStandardItem(text))
+                    finally:
+                        self.table_view.setUpdatesEnabled(True)
 
                     print(f"Loaded file: {file_path}")
                     self.update_row_column_count()
@@ -757,13 +804,18 @@ class VideoPlayerApp(QMainWindow):
             # テーブルの内容を取得
             rows = self.model.rowCount()
             cols = self.model.columnCount()
+            get_item = self.model.item
+            lines = []
+            for row in range(rows):
+                row_data = []
+                for col in range(cols):
+                    item = get_item(row, col)
+                    row_data.append(item.text() if item else "")  # セルが空の場合は空文字列を追加
+                lines.append(" ".join(row_data) + "\n")  # 行ごとにスペース区切り
+
+            # 書き込みは1回にまとめる
             with open(save_file_name, "w") as file:
-                for row in range(rows):
-                    row_data = []
-                    for col in range(cols):
-                        item = self.model.item(row, col)
-                        row_data.append(item.text() if item else "")  # セルが空の場合は空文字列を追加
-                    file.write(" ".join(row_data) + "\n")  # 行ごとにスペース区切りで保存
+                file.write("".join(lines))
 
             print(f"Table contents saved to {save_file_name}")
         except Exception as e:
@@ -777,22 +829,18 @@ class VideoPlayerApp(QMainWindow):
 
     def rewind_one_frame(self):
         """再生位置を1フレーム分戻し、キーフレームかどうかを判定して表示"""
-        # フレームごとの再生時間を計算（ミリ秒単位）
-        frame_duration_ms = 1000 / self.frame_rate
-
         # 現在の再生位置を取得
         current_position = self.media_player.position()  # ミリ秒単位
-        new_position = max(0, current_position - frame_duration_ms)  # 新しい再生位置を計算
+        new_position = max(0, current_position - self._frame_duration_ms)  # 新しい再生位置を計算
 
-        # 動画ファイルを使用して現在のフレーム情報を取得
-        cap = cv2.VideoCapture(self.file_name)  # `self.video_file_path` に動画のパスを設定
-        if not cap.isOpened():
+        # 動画読み込み時に開いた VideoCapture で現在のフレーム情報を取得
+        cap = self._cap
+        if cap is None:
             print("Failed to open video file.")
             return
 
-        # 動画フレームレートを取得
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_index = int(new_position / 1000 * fps)  # フレームインデックスを計算
+        # 動画フレームレートは開いたときに取得済み
+        frame_index = int(new_position / 1000 * self._cap_fps)  # フレームインデックスを計算
 
         # フレーム位置を設定
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
@@ -800,7 +848,6 @@ class VideoPlayerApp(QMainWindow):
 
         if not ret:
             print(f"Failed to read frame at index {frame_index}")
-            cap.release()
             return
 
         # キーフレーム判定 (CAP_PROP_POS_AVI_RATIO や CAP_PROP_CODEC_PIXEL_FORMAT を利用する場合もある)
@@ -878,6 +925,9 @@ class VideoPlayerApp(QMainWindow):
             self.media_player.setSource(QUrl.fromLocalFile(file_path))
             self.play_pause_button.setEnabled(True)
 
+            # フレーム単位の操作用に VideoCapture を開いておく
+            self._open_capture(file_path)
+
             # フレームレートを設定
             frame_rate = self.get_frame_rate(file_path)
             self.set_frame_rate(frame_rate)
@@ -892,7 +942,7 @@ class VideoPlayerApp(QMainWindow):
             # 動画を再生
             #self.media_player.setPlaybackRate(2.0)
             self.media_player.play()
-            self.play_pause_button.setIcon(QIcon(PATH+"/icons/pause.png"))  # 再生時にpause.pngを設定
+            self.play_pause_button.setIcon(self._pause_icon)  # 再生時にpause.pngを設定
             self.file_name = file_path  # フルパスで保持
         else:
             print(f"File not found: {file_path}")
@@ -1,5 +1,5 @@
 """UIコンポーネントパッケージ"""
 
-from .custom_ui_loader import CustomUiLoader
+from .custom_ui_loader import CustomUiLoader, ClickFocusVideoWidget
 
-__all__ = ['CustomUiLoader']
\ No newline at end of file
+__all__ = ['CustomUiLoader', 'ClickFocusVideoWidget']
\ No newline at end of file
@@ -6,6 +6,15 @@ from PySide6.QtUiTools import QUiLoader
 from PySide6.QtMultimediaWidgets import QVideoWidget
 
 
+class ClickFocusVideoWidget(QVideoWidget):
+    """クリック時にトップレベルウィンドウへフォーカスを移すビデオウィジェット"""
+    
+    def mousePressEvent(self, event):
+        """マウスクリックでメインウィンドウにフォーカスを移動"""
+        self.window().setFocus()
+        super().mousePressEvent(event)
+
+
 class CustomUiLoader(QUiLoader):
     """カスタムUIローダークラス"""
     
@@ -16,7 +25,7 @@ class CustomUiLoader(QUiLoader):
     def createWidget(self, class_name, parent=None, name=""):
         """ウィジェットを作成"""
         if class_name == "QVideoWidget":
-            widget = QVideoWidget(parent)
+            widget = ClickFocusVideoWidget(parent)
         else:
             widget = super().createWidget(class_name, parent, name)
         
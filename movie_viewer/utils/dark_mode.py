@@ -2,15 +2,30 @@
 OS別のダークモード検出機能
 """
 
+import ctypes
+import os
 import platform
+import plistlib
+from functools import lru_cache
+
+
+# Windows のテーマ設定を保持するレジストリキーと値の名前（呼び出しごとに確保しない）
+_PERSONALIZE_KEY = ctypes.create_unicode_buffer(
+    "SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Themes\\Personalize"
+)
+_LIGHT_THEME_VALUE = ctypes.create_unicode_buffer("AppsUseLightTheme")
+
+# macOS のグローバル設定ファイル（ダークモード時のみ AppleInterfaceStyle = "Dark"）
+_GLOBAL_PREFERENCES = "~/Library/Preferences/.GlobalPreferences.plist"
 
 
 class DarkModeDetector:
     """ダークモード検出を担当するクラス"""
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def is_dark_mode() -> bool:
-        """OSのダークモード設定を検出"""
+        """OSのダークモード設定を検出（結果はプロセス内でキャッシュされる）"""
         system = platform.system()
         
         if system == "Darwin":
@@ -20,36 +35,31 @@ class DarkModeDetector:
         return False
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def _is_dark_mode_macos() -> bool:
         """macOSでのダークモード判定"""
+        # AppKit を読み込まず、設定ファイルを直接読む
         try:
-            from AppKit import NSApplication, NSAppearance
-            app = NSApplication.sharedApplication()
-            appearance = app.effectiveAppearance()
-            best_match = appearance.bestMatchFromAppearancesWithNames_([
-                "NSAppearanceNameAqua", "NSAppearanceNameDarkAqua"
-            ])
-            return best_match == "NSAppearanceNameDarkAqua"
+            with open(os.path.expanduser(_GLOBAL_PREFERENCES), "rb") as file:
+                return plistlib.load(file).get("AppleInterfaceStyle") == "Dark"
+        except FileNotFoundError:
+            return False
         except Exception as e:
             print(f"Error determining dark mode on macOS: {e}")
             return False
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def _is_dark_mode_windows() -> bool:
         """Windowsでのダークモード判定"""
         try:
-            import ctypes
             registry = ctypes.windll.advapi32
-            key = ctypes.create_unicode_buffer(
-                "SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Themes\\Personalize"
-            )
-            value = ctypes.create_unicode_buffer("AppsUseLightTheme")
             data = ctypes.c_long()
             size = ctypes.c_ulong(ctypes.sizeof(data))
             
             hkey = ctypes.c_void_p()
-            if registry.RegOpenKeyExW(0x80000001, key, 0, 0x20019, ctypes.byref(hkey)) == 0:
-                if registry.RegQueryValueExW(hkey, value, 0, None, ctypes.byref(data), ctypes.byref(size)) == 0:
+            if registry.RegOpenKeyExW(0x80000001, _PERSONALIZE_KEY, 0, 0x20019, ctypes.byref(hkey)) == 0:
+                if registry.RegQueryValueExW(hkey, _LIGHT_THEME_VALUE, 0, None, ctypes.byref(data), ctypes.byref(size)) == 0:
                     registry.RegCloseKey(hkey)
                     return data.value == 0
         except Exception as e: